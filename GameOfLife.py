@@ -25,8 +25,8 @@
 import os
 
 import numpy as np
-from PIL import Image
-from scipy import ndimage
+
+from GolStats import GolStats, HISTORY_SIZE
 
 PIXEL_MAX = 255  # Constant representing the value of alive cells pixels (matrix elements)
 DECAY = 0.9  # Constant representing the decay rate of past states when calculating the heat map
@@ -46,16 +46,26 @@ class GameOfLife:
         do_heatmap      boolean value defining what to return in get_state (the state or the heatmap)
         x, y            current board dimensions
         initial_state   backed up initial state that becomes the state when/if reset
+        generation      number of steps computed since the last (re)initialization, reset or load
+        population      current number of living cells
+        births, deaths  number of cells born and died during the last step
+        bounding_box    (top, left, bottom, right) inclusive box containing all living cells, None if board is empty.
+                        After cells are killed by hand it can be too large until the next step: get_bounding_box()
+                        always returns the exact box
+        bounding_box_exact  False if bounding_box can be too large
+        stats           population time series (GolStats ring buffer)
     """
 
-    def __init__(self, x=100, y=150, mode='empty'):
+    def __init__(self, x=100, y=150, mode='empty', history_size=HISTORY_SIZE):
         """
         Init method.
 
         Args:
-            x, y    default dimensions of the game board
-            mode    default initial game mode: empty or random
+            x, y            default dimensions of the game board
+            mode            default initial game mode: empty or random
+            history_size    number of generations kept in the population history
         """
+        self.stats = GolStats(history_size)
         self.reinitialize(mode, x, y)
         self.do_heatmap = False
 
@@ -81,24 +91,71 @@ class GameOfLife:
             self.mat[indexes_p] = PIXEL_MAX
         self.initial_state = np.copy(self.mat)
         self.heatmap = np.copy(self.mat)
+        self.reset_stats()
 
     def reset(self):
         """Resets the state of the game to the backed up initial_state"""
         self.mat = np.copy(self.initial_state)
         self.heatmap = np.copy(self.mat)
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Recomputes the statistics from the whole current state and restarts the population history"""
+        alive = self.mat > 128
+        self.generation = 0
+        self.population = int(np.count_nonzero(alive))
+        self.births = 0
+        self.deaths = 0
+        self.bounding_box = find_bounding_box(alive)
+        self.bounding_box_exact = True
+        self.stats.clear()
+        self.stats.append(self.generation, self.population)
 
     def next(self):
         """
         This method is the engine of the game. Calculates and updates the next state of the game following the rules.
-        It also updates the heatmap state.
+        It also updates the heatmap state and the statistics (population, births, deaths, bounding box and history).
+
+        Cells can only change inside the bounding box of the living cells grown by one cell, so the statistics are
+        computed on that window only.
         """
+        from scipy import ndimage  # deferred: importing scipy slows down the startup of the GUI
+
+        window = self._active_window()
+        old_alive = self.mat[window] > 128 if window is not None else None
+
         res = ndimage.uniform_filter(self.mat, size=3, mode='constant', cval=0)
         res[self.mat > 128] = res[self.mat > 128] - int((1 / 9) * PIXEL_MAX)
         self.mat[res <= int((1 / 9) * PIXEL_MAX)] = 0
         self.mat[res >= int((4 / 9) * PIXEL_MAX)] = 0
         self.mat[res == int((3 / 9) * PIXEL_MAX)] = PIXEL_MAX
+        alive = self.mat > 128
         self.heatmap = np.array(self.heatmap * DECAY, dtype=np.uint8)
-        self.heatmap[self.mat > 128] = PIXEL_MAX
+        self.heatmap[alive] = PIXEL_MAX
+
+        self.generation += 1
+        if window is not None:
+            new_alive = alive[window]
+            self.births = int(np.count_nonzero(new_alive & ~old_alive))
+            self.deaths = int(np.count_nonzero(old_alive & ~new_alive))
+            self.population += self.births - self.deaths
+            box = find_bounding_box(new_alive)
+            if box is not None:
+                box = (box[0] + window[0].start, box[1] + window[1].start,
+                       box[2] + window[0].start, box[3] + window[1].start)
+            self.bounding_box = box
+        else:
+            self.births = 0
+            self.deaths = 0
+        self.bounding_box_exact = True
+        self.stats.append(self.generation, self.population, self.births, self.deaths)
+
+    def _active_window(self):
+        """Returns the slices of the bounding box grown by one cell (clipped to the board), None if board is empty"""
+        if self.bounding_box is None:
+            return None
+        top, left, bottom, right = self.bounding_box
+        return slice(max(top - 1, 0), bottom + 2), slice(max(left - 1, 0), right + 2)
 
     def get_state(self):
         """Getter for the current state which can be the state matrix ot the heatmap matrix depending on do_heatmap"""
@@ -107,16 +164,222 @@ class GameOfLife:
         else:
             return self.mat
 
+    def get_generation(self):
+        """Getter for the number of steps computed since the last (re)initialization, reset or load"""
+        return self.generation
+
+    def get_population(self):
+        """Getter for the current number of living cells"""
+        return self.population
+
+    def get_births(self):
+        """Getter for the number of cells born during the last step"""
+        return self.births
+
+    def get_deaths(self):
+        """Getter for the number of cells died during the last step"""
+        return self.deaths
+
+    def get_bounding_box(self):
+        """Getter for the (top, left, bottom, right) inclusive box containing all living cells (None if empty)"""
+        if not self.bounding_box_exact:
+            # cells were killed by hand: shrink the box searching only inside the old one
+            top, left, bottom, right = self.bounding_box
+            box = find_bounding_box(self.mat[top:bottom + 1, left:right + 1] > 128)
+            if box is not None:
+                box = (box[0] + top, box[1] + left, box[2] + top, box[3] + left)
+            self.bounding_box = box
+            self.bounding_box_exact = True
+        return self.bounding_box
+
+    def get_population_history(self):
+        """
+        Getter for the population time series since the last (re)initialization, reset or load.
+
+        Returns:
+            tuple       (generations, population, births, deaths) numpy arrays in chronological order
+        """
+        return self.stats.get_series()
+
     def set_active_cell(self, i, j):
         """Sets the cell at position (i, j) to be active(alive)"""
+        if self.mat[i, j] <= 128:
+            self.population += 1
+            self._grow_bounding_box((i, j, i, j))
         self.mat[i, j] = PIXEL_MAX
         self.heatmap[i, j] = PIXEL_MAX
 
     def set_inactive_cell(self, i, j):
         """Sets the cell at position (i, j) to be inactive(dead)"""
+        if self.mat[i, j] > 128:
+            self.population -= 1
+            self.bounding_box_exact = False  # the box is still valid but may be too large
         self.mat[i, j] = 0
         self.heatmap[i, j] = 0
 
+    def set_cells(self, rows, cols, alive=True):
+        """
+        Sets many cells at once with one vectorized write (indexes out of the board are ignored).
+
+        Args:
+            rows, cols  arrays (of the same shape) of the row and column indexes of the cells
+            alive       True to set the cells active(alive), False to set them inactive(dead)
+        """
+        rows = np.ravel(rows).astype(np.intp)
+        cols = np.ravel(cols).astype(np.intp)
+        inside = (rows >= 0) & (rows < self.mat.shape[0]) & (cols >= 0) & (cols < self.mat.shape[1])
+        if not inside.any():
+            return
+        rows = rows[inside]
+        cols = cols[inside]
+        flat = np.unique(rows * self.mat.shape[1] + cols)  # duplicates would be counted twice in the statistics
+        was_alive = np.take(self.mat, flat) > 128
+        if alive:
+            self.population += int(np.count_nonzero(~was_alive))
+            self._grow_bounding_box((int(rows.min()), int(cols.min()), int(rows.max()), int(cols.max())))
+            value = PIXEL_MAX
+        else:
+            if was_alive.any():
+                self.population -= int(np.count_nonzero(was_alive))
+                self.bounding_box_exact = False  # the box is still valid but may be too large
+            value = 0
+        np.put(self.mat, flat, value)
+        np.put(self.heatmap, flat, value)
+
+    def draw_line(self, i0, j0, i1, j1, alive=True, brush=1):
+        """
+        Sets the cells of the segment from (i0, j0) to (i1, j1) (ends included), without gaps, in one write.
+
+        The segment is rasterized into a mask covering only its bounding box (grown by the brush): every row of the
+        mask is an interval of columns, so the mask is built from two arrays of interval ends.
+
+        Args:
+            i0, j0      first end of the segment
+            i1, j1      second end of the segment
+            alive       True to draw living cells, False to kill them
+            brush       side of the square brush centered on each cell of the segment
+        """
+        brush = max(brush, 1)
+        low = brush // 2  # brush cells before (above or left of) its center
+        if i0 == i1 and j0 == j1:
+            self.set_rect(i0 - low, j0 - low, i0 - low + brush - 1, j0 - low + brush - 1, alive)
+            return
+        top = min(i0, i1)
+        left = min(j0, j1)
+        height = abs(i1 - i0) + 1
+        n = max(height, abs(j1 - j0) + 1)
+        rows = np.rint(np.linspace(i0, i1, n)).astype(np.intp) - top
+        cols = np.rint(np.linspace(j0, j1, n)).astype(np.intp) - left
+        # columns interval of the 1 cell wide segment on each of its rows
+        big = np.iinfo(np.intp).max
+        first = np.full(height + 2 * (brush - 1), big, dtype=np.intp)
+        last = np.full(height + 2 * (brush - 1), -1, dtype=np.intp)
+        np.minimum.at(first, rows + brush - 1, cols)
+        np.maximum.at(last, rows + brush - 1, cols)
+        # the brush square of the segment cell on row r covers the mask rows r to r + brush - 1
+        start = first[:height + brush - 1].copy()
+        end = last[:height + brush - 1].copy()
+        for d in range(1, brush):
+            np.minimum(start, first[d:d + height + brush - 1], out=start)
+            np.maximum(end, last[d:d + height + brush - 1], out=end)
+        mask_cols = np.arange(abs(j1 - j0) + brush)
+        mask = (mask_cols[None, :] >= start[:, None]) & (mask_cols[None, :] <= end[:, None] + brush - 1)
+        self.paste(mask, top - low, left - low, mode='or' if alive else 'clear')
+
+    def set_rect(self, top, left, bottom, right, alive=True):
+        """
+        Sets all the cells of a rectangle (clipped to the board) with one slice write.
+
+        Args:
+            top, left       indexes of the top left cell of the rectangle
+            bottom, right   indexes of the bottom right cell of the rectangle (included)
+            alive           True to fill the rectangle with living cells, False to clear it
+        """
+        top = max(top, 0)
+        left = max(left, 0)
+        bottom = min(bottom, self.mat.shape[0] - 1)
+        right = min(right, self.mat.shape[1] - 1)
+        if top > bottom or left > right:
+            return
+        region = self.mat[top:bottom + 1, left:right + 1]
+        before = int(np.count_nonzero(region))  # cells are either 0 or PIXEL_MAX
+        if alive:
+            region[...] = PIXEL_MAX
+            self.heatmap[top:bottom + 1, left:right + 1] = PIXEL_MAX
+            self.population += region.size - before
+            self._grow_bounding_box((top, left, bottom, right))
+        else:
+            region[...] = 0
+            self.heatmap[top:bottom + 1, left:right + 1] = 0
+            if before:
+                self.population -= before
+                self.bounding_box_exact = False  # the box is still valid but may be too large
+
+    def paste(self, pattern, i=0, j=0, mode='or'):
+        """
+        Pastes a sub-pattern on the board (clipped to the board) with one slice write.
+
+        Args:
+            pattern     state matrix of the pattern (0 dead cells, PIXEL_MAX living cells) or boolean matrix
+            i, j        board position of the top left cell of the pattern
+            mode        'or' to add the living cells of the pattern, 'replace' to copy also its dead cells,
+                        'clear' to kill the cells where the pattern is alive
+
+        Returns:
+            bool        True for success, False if mode is not valid
+        """
+        if mode not in ('or', 'replace', 'clear'):
+            print('Wrong paste mode')
+            return False
+        pattern = np.asarray(pattern)
+        if pattern.dtype == np.uint8:
+            pattern = pattern > 128
+        elif pattern.dtype != bool:
+            pattern = pattern != 0  # e.g. 0/1 integer matrices
+        top = max(i, 0)
+        left = max(j, 0)
+        bottom = min(i + pattern.shape[0], self.mat.shape[0])
+        right = min(j + pattern.shape[1], self.mat.shape[1])
+        if top >= bottom or left >= right:
+            return True
+        pattern = pattern[top - i:bottom - i, left - j:right - j]
+        region = self.mat[top:bottom, left:right]
+        heat = self.heatmap[top:bottom, left:right]
+        old_alive = region > 128
+        # only the masks needed by the mode are computed (living cells always have PIXEL_MAX heat already)
+        born = pattern & ~old_alive if mode != 'clear' else None
+        if mode == 'clear':
+            died = pattern & old_alive
+        elif mode == 'replace':
+            died = old_alive & ~pattern
+        else:
+            died = None
+
+        if born is not None:
+            births = int(np.count_nonzero(born))
+            if births:
+                region[born] = PIXEL_MAX
+                heat[born] = PIXEL_MAX
+                self.population += births
+                box = find_bounding_box(born)
+                self._grow_bounding_box((box[0] + top, box[1] + left, box[2] + top, box[3] + left))
+        if died is not None:
+            deaths = int(np.count_nonzero(died))
+            if deaths:
+                region[died] = 0
+                heat[died] = 0
+                self.population -= deaths
+                self.bounding_box_exact = False  # the box is still valid but may be too large
+        return True
+
+    def _grow_bounding_box(self, box):
+        """Grows the bounding box to contain box (top, left, bottom, right)"""
+        if self.bounding_box is None:
+            self.bounding_box = box
+        else:
+            self.bounding_box = (min(self.bounding_box[0], box[0]), min(self.bounding_box[1], box[1]),
+                                 max(self.bounding_box[2], box[2]), max(self.bounding_box[3], box[3]))
+
     def load(self, file_name):
         """
         Loads the state from file.
@@ -127,50 +390,25 @@ class GameOfLife:
         Returns:
             bool        True for success (file existing and correct format), False otherwise.
         """
-        extension = os.path.splitext(file_name)[1][1:]
-        if extension == "png":
-            im_frame = Image.open(file_name).convert('L')
-            width, height = im_frame.size
-            self.x = height
-            self.y = width
-            np_frame = np.array(im_frame.getdata())
-            np_frame = np.reshape(np_frame, (-1, width))
-            self.mat = np.zeros(np_frame.shape, dtype=np.uint8)
-            self.mat[np_frame > 128] = PIXEL_MAX
-            self.initial_state = np.copy(self.mat)
-            self.heatmap = np.copy(self.mat)
-            return True
-        elif extension == "txt":
-            rows = 0
-            cols = 0
-            with open(file_name) as f:
-                for i, l in enumerate(f):
-                    if l[0] != "#":
-                        rows += 1
-                        if len(l) > cols:
-                            cols = len(l)
-
-            self.mat = np.zeros((rows, cols), dtype=np.uint8)
-
-            hash_rows = 0
-            with open(file_name) as f:
-                for j, line in enumerate(f):
-                    for k, c in enumerate(line):
-                        if c == "#" and k is 0:
-                            hash_rows += 1
-                            break
-                        elif c != "." and c != "\n":
-                            self.mat[j-hash_rows, k] = PIXEL_MAX
-
-            self.x = rows
-            self.y = cols
-
-            self.initial_state = np.copy(self.mat)
-            self.heatmap = np.copy(self.mat)
-            return True
-        else:
+        mat = read_pattern(file_name)
+        if mat is None:
             print('Wrong file type')
             return False
+        self.set_board(mat)
+        return True
+
+    def set_board(self, mat):
+        """
+        Sets a new board as current and initial state (the matrix is copied).
+
+        Args:
+            mat         state matrix (0 dead cells, PIXEL_MAX living cells)
+        """
+        self.mat = np.array(mat, dtype=np.uint8)
+        self.x, self.y = self.mat.shape
+        self.initial_state = np.copy(self.mat)
+        self.heatmap = np.copy(self.mat)
+        self.reset_stats()
 
     def save(self, file_name):
         """
@@ -185,5 +423,56 @@ class GameOfLife:
         else:
             path = file_name + ".png"
 
+        from PIL import Image  # deferred: importing PIL slows down the startup of the GUI
+
         im = Image.fromarray(self.mat)
         im.save(path)
+
+
+def find_bounding_box(alive):
+    """
+    Finds the bounding box of the living cells.
+
+    Args:
+        alive       boolean numpy array (True for living cells)
+
+    Returns:
+        tuple       (top, left, bottom, right) inclusive indexes, None if there are no living cells
+    """
+    rows = np.flatnonzero(alive.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(alive.any(axis=0))
+    return int(rows[0]), int(cols[0]), int(rows[-1]), int(cols[-1])
+
+
+def read_pattern(file_name):
+    """
+    Reads a state matrix from file.
+
+    Args:
+        file_name   name of the file. It can be a TXT (with known format) or PNG file
+
+    Returns:
+        np.ndarray  the state matrix (0 dead cells, PIXEL_MAX living cells), None if the file type is not supported
+    """
+    extension = os.path.splitext(file_name)[1][1:]
+    if extension == "png":
+        from PIL import Image  # deferred: importing PIL slows down the startup of the GUI
+
+        np_frame = np.array(Image.open(file_name).convert('L'))
+        mat = np.zeros(np_frame.shape, dtype=np.uint8)
+        mat[np_frame > 128] = PIXEL_MAX
+        return mat
+    elif extension == "txt":
+        with open(file_name) as f:
+            lines = [l for l in f if l[0] != "#"]
+        cols = max([len(l) for l in lines], default=0)
+        mat = np.zeros((len(lines), cols), dtype=np.uint8)
+        for j, line in enumerate(lines):
+            for k, c in enumerate(line):
+                if c != "." and c != "\n":
+                    mat[j, k] = PIXEL_MAX
+        return mat
+    else:
+        return None
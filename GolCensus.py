@@ -0,0 +1,340 @@
+##
+## MIT License
+## 
+## Copyright (c) 2017 Luca Angioloni
+## 
+## Permission is hereby granted, free of charge, to any person obtaining a copy
+## of this software and associated documentation files (the "Software"), to deal
+## in the Software without restriction, including without limitation the rights
+## to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+## copies of the Software, and to permit persons to whom the Software is
+## furnished to do so, subject to the following conditions:
+## 
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+## 
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+##
+
+import json
+import os
+from collections import Counter
+
+import numpy as np
+from scipy import ndimage
+
+from GameOfLife import GameOfLife, PIXEL_MAX, find_bounding_box
+from PatternLibrary import PatternLibrary
+
+CENSUS_VERSION = 2  # Version of the index format and of the built-in table (bump to invalidate the cached indexes)
+CENSUS_GENERATIONS = 30  # Number of generations evolved looking for the period of oscillators and spaceships
+UNKNOWN = "unknown"  # Name given to the objects not found in the index
+
+# Built-in table of common objects (same format of the TXT pattern files)
+COMMON_OBJECTS = {
+    "block": ["XX",
+              "XX"],
+    "beehive": [".XX.",
+                "X..X",
+                ".XX."],
+    "loaf": [".XX.",
+             "X..X",
+             ".X.X",
+             "..X."],
+    "boat": ["XX.",
+             "X.X",
+             ".X."],
+    "ship": ["XX.",
+             "X.X",
+             ".XX"],
+    "tub": [".X.",
+            "X.X",
+            ".X."],
+    "pond": [".XX.",
+             "X..X",
+             "X..X",
+             ".XX."],
+    "barge": [".X..",
+              "X.X.",
+              ".X.X",
+              "..X."],
+    "long-boat": ["XX..",
+                  "X.X.",
+                  ".X.X",
+                  "..X."],
+    "blinker": ["XXX"],
+    "toad": [".XXX",
+             "XXX."],
+    "beacon": ["XX..",
+               "XX..",
+               "..XX",
+               "..XX"],
+    "glider": [".X.",
+               "..X",
+               "XXX"],
+    "lwss": [".X..X",
+             "X....",
+             "X...X",
+             "XXXX."],
+    "mwss": ["...X..",
+             ".X...X",
+             "X.....",
+             "X....X",
+             "XXXXX."],
+    "hwss": ["...XX..",
+             ".X....X",
+             "X......",
+             "X.....X",
+             "XXXXXX."],
+}
+
+
+def pattern_key(cluster):
+    """
+    Hash key of a cluster (exact: same shape and same cells).
+
+    Args:
+        cluster     boolean numpy array cropped to the bounding box of the cluster
+
+    Returns:
+        str         "<height>x<width>:<hex of the packed cells>"
+    """
+    cluster = np.ascontiguousarray(cluster, dtype=bool)
+    return "{}x{}:{}".format(cluster.shape[0], cluster.shape[1], np.packbits(cluster).tobytes().hex())
+
+
+def key_to_cluster(key):
+    """Inverse of pattern_key: returns (height, width, packed cells as numpy uint8 array)"""
+    shape, cells = key.split(":")
+    height, width = (int(v) for v in shape.split("x"))
+    return height, width, np.frombuffer(bytes.fromhex(cells), dtype=np.uint8)
+
+
+def orientations(cluster):
+    """Returns the 8 rotations and reflections of a cluster"""
+    return [np.rot90(c, k) for c in (cluster, cluster.T) for k in range(4)]
+
+
+def canonical_key(cluster):
+    """
+    Key of a cluster independent of its rotation and reflection (the smallest key among the 8 orientations).
+
+    Args:
+        cluster     boolean numpy array cropped to the bounding box of the cluster
+
+    Returns:
+        str         the canonical key
+    """
+    return min(pattern_key(c) for c in orientations(cluster))
+
+
+class GolCensus:
+    """
+    Object census of a Game of Life board: finds the clusters of living cells and identifies them.
+
+    The known objects are the ones of the built-in table (COMMON_OBJECTS) plus the patterns of a PatternLibrary that
+    are still lifes, oscillators or spaceships. Each of them is evolved until it repeats a phase to collect all of its
+    phases. The canonical keys of the phases are cached in the cache directory of the library and the cache is rebuilt
+    only when the pattern files change. In memory every phase is indexed in all its orientations, so identifying a
+    cluster costs a single lookup.
+
+    Some objects (like toad, beacon and pulsar) split in separate clusters in some phases: only the clusters that are
+    unidentified or identified as a possible part of such a phase are merged with the close ones, at increasing
+    spacing, and looked up again.
+
+    Attributes:
+        library             PatternLibrary of the pattern files
+        cache_file          file where the index is cached
+        spacing             cells at distance (rows or columns) up to spacing belong to the same object
+        index               dictionary from pattern_key (every phase and orientation) to object name
+        parts               names of the objects that are also a part of a phase split in separate clusters
+        merge_spacing       spacing that groups every phase split in separate clusters into one object
+    """
+
+    def __init__(self, library=None, spacing=1):
+        """
+        Init method.
+
+        Args:
+            library     PatternLibrary of the pattern files (default: library of the patterns directory of the project)
+            spacing     1 to group only touching cells, 2 to group also cells separated by one empty cell
+        """
+        if library is None:
+            library = PatternLibrary(os.path.join(os.path.dirname(os.path.abspath(__file__)), "patterns"))
+        self.library = library
+        self.cache_file = os.path.join(library.cache_dir, "census.json")
+        self.spacing = spacing
+        self.index = {}
+        canonical = self.load_index()
+        if canonical is None:
+            canonical = self.build_index()
+            self.save_index(canonical)
+        phases = []
+        for key, name in canonical.items():
+            height, width, cells = key_to_cluster(key)
+            phases.append(np.unpackbits(cells, count=height * width).reshape(height, width).astype(bool))
+            for c in orientations(phases[-1]):
+                self.index.setdefault(pattern_key(c), name)
+        self.parts = set()
+        self.merge_spacing = self.spacing
+        for phase in phases:
+            labels, slices = self.label(phase)
+            if len(slices) > 1:
+                self.parts.update(self.identify(labels[sl] == k) for k, sl in enumerate(slices, 1))
+                spacing = self.spacing + 1
+                while len(self.label(phase, spacing)[1]) > 1:
+                    spacing += 1
+                self.merge_spacing = max(self.merge_spacing, spacing)
+        self.parts.discard(UNKNOWN)
+
+    def label(self, alive, spacing=None):
+        """
+        Labels the objects of a board in one pass.
+
+        Args:
+            alive       boolean matrix of the living cells
+            spacing     cells at distance up to spacing belong to the same object (default: self.spacing)
+
+        Returns:
+            tuple       (labels, slices): labels matrix (0 for dead cells) and bounding box slices of each label
+        """
+        if spacing is None:
+            spacing = self.spacing
+        if spacing > 1:
+            # dilating by spacing x spacing makes the cells closer than spacing + 1 touch each other
+            grouped = ndimage.binary_dilation(alive, structure=np.ones((spacing, spacing), dtype=bool))
+        else:
+            grouped = alive
+        labels, _ = ndimage.label(grouped, structure=np.ones((3, 3), dtype=bool))
+        if spacing > 1:
+            labels[~alive] = 0
+        return labels, ndimage.find_objects(labels)
+
+    def clusters(self, mat):
+        """Returns the list of the objects of a board as boolean arrays cropped to their bounding boxes"""
+        labels, slices = self.label(np.asarray(mat) > 128)
+        return [labels[sl] == k for k, sl in enumerate(slices, 1) if sl is not None]
+
+    def identify(self, cluster):
+        """
+        Identifies an object.
+
+        Args:
+            cluster     boolean numpy array cropped to the bounding box of the object
+
+        Returns:
+            str         name of the object or UNKNOWN
+        """
+        return self.index.get(pattern_key(cluster), UNKNOWN)
+
+    def census(self, mat):
+        """
+        Counts the objects on a board.
+
+        Args:
+            mat         state matrix (like GameOfLife.mat)
+
+        Returns:
+            Counter     number of objects of each kind (the unidentified ones are counted as UNKNOWN)
+        """
+        alive = np.asarray(mat) > 128
+        labels, slices = self.label(alive)
+        names = {k: self.identify(labels[sl] == k) for k, sl in enumerate(slices, 1) if sl is not None}
+        counts = Counter()
+        for spacing in range(self.spacing + 1, self.merge_spacing + 1):
+            split = [k for k, name in names.items() if name == UNKNOWN or name in self.parts]
+            if len(split) < 2:
+                break
+            merged_labels, merged_slices = self.label(np.isin(labels, split), spacing)
+            for k, sl in enumerate(merged_slices, 1):
+                if sl is None:
+                    continue
+                group = merged_labels[sl] == k
+                members = np.unique(labels[sl][group])
+                if len(members) > 1:
+                    name = self.identify(group)
+                    if name != UNKNOWN:  # a phase split in separate clusters: count it once
+                        counts[name] += 1
+                        for m in members:
+                            del names[m]
+        counts.update(names.values())
+        return counts
+
+    def build_index(self):
+        """
+        Builds the index from the built-in table and from the pattern files.
+
+        Returns:
+            dict        canonical key of each phase -> object name
+        """
+        canonical = {}
+        for name, rows in COMMON_OBJECTS.items():
+            cluster = np.array([[c != "." for c in row] for row in rows], dtype=bool)
+            self.add_phases(canonical, name, cluster)
+
+        parsed = bool(self.library.stale_names())
+        for f in self.library.names():
+            board = self.library.get_board(f)
+            if board is not None and board.any():  # invalid (unreadable) and empty patterns are skipped
+                alive = board > 128
+                top, left, bottom, right = find_bounding_box(alive)
+                self.add_phases(canonical, os.path.splitext(f)[0], alive[top:bottom + 1, left:right + 1])
+        if parsed:
+            self.library.save_index()
+        return canonical
+
+    def add_phases(self, canonical, name, cluster):
+        """
+        Evolves an object looking for a repeated phase: if found the canonical keys of the phases of the cycle are
+        added to the index, otherwise (not a still life, oscillator or spaceship) nothing is added.
+        """
+        pad = CENSUS_GENERATIONS + 2  # enough room for a spaceship to move without touching the borders
+        gol = GameOfLife()
+        board = np.zeros((cluster.shape[0] + 2 * pad, cluster.shape[1] + 2 * pad), dtype=np.uint8)
+        board[pad:pad + cluster.shape[0], pad:pad + cluster.shape[1]][cluster] = PIXEL_MAX
+        gol.set_board(board)
+        keys = []
+        for _ in range(CENSUS_GENERATIONS + 1):
+            box = gol.get_bounding_box()
+            if box is None:
+                return
+            top, left, bottom, right = box
+            key = canonical_key(gol.mat[top:bottom + 1, left:right + 1] > 128)
+            if key in keys:
+                for k in keys[keys.index(key):]:
+                    canonical.setdefault(k, name)
+                return
+            keys.append(key)
+            gol.next()
+
+    def load_index(self):
+        """
+        Loads the cached index if still valid.
+
+        Returns:
+            dict        canonical key -> object name, None if the cache is missing or outdated
+        """
+        try:
+            with open(self.cache_file) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cache.get("version") != CENSUS_VERSION or cache.get("files") != self.library.signature():
+            return None
+        return cache.get("index")
+
+    def save_index(self, canonical):
+        """Writes the index to the cache file (a read only patterns directory just disables the cache)"""
+        cache = {"version": CENSUS_VERSION, "files": self.library.signature(), "index": canonical}
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, "w") as f:
+                json.dump(cache, f)
+        except OSError:
+            pass
@@ -0,0 +1,103 @@
+##
+## MIT License
+## 
+## Copyright (c) 2017 Luca Angioloni
+## 
+## Permission is hereby granted, free of charge, to any person obtaining a copy
+## of this software and associated documentation files (the "Software"), to deal
+## in the Software without restriction, including without limitation the rights
+## to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+## copies of the Software, and to permit persons to whom the Software is
+## furnished to do so, subject to the following conditions:
+## 
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+## 
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+##
+
+import numpy as np
+
+HISTORY_SIZE = 2048  # Default number of generations kept in the population history
+
+
+class GolStats:
+    """
+    Fixed size ring buffer holding the population time series of a game.
+
+    All the arrays are preallocated once, so appending a generation never allocates memory.
+    When the buffer is full the oldest generations are overwritten.
+
+    Attributes:
+        capacity        maximum number of generations stored
+        generations     generation numbers (ring buffer)
+        population      number of living cells at each generation (ring buffer)
+        births          number of cells born at each generation (ring buffer)
+        deaths          number of cells died at each generation (ring buffer)
+        head            index of the next slot to be written
+        count           number of valid slots in the buffer
+    """
+
+    def __init__(self, capacity=HISTORY_SIZE):
+        """
+        Init method.
+
+        Args:
+            capacity    maximum number of generations stored
+        """
+        self.capacity = capacity
+        self.generations = np.zeros(capacity, dtype=np.int64)
+        self.population = np.zeros(capacity, dtype=np.int64)
+        self.births = np.zeros(capacity, dtype=np.int64)
+        self.deaths = np.zeros(capacity, dtype=np.int64)
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Empties the buffer (the arrays are kept and reused)"""
+        self.head = 0
+        self.count = 0
+
+    def append(self, generation, population, births=0, deaths=0):
+        """
+        Stores the statistics of one generation, overwriting the oldest one if the buffer is full.
+
+        Args:
+            generation  generation number
+            population  number of living cells
+            births      number of cells born in this generation
+            deaths      number of cells died in this generation
+        """
+        self.generations[self.head] = generation
+        self.population[self.head] = population
+        self.births[self.head] = births
+        self.deaths[self.head] = deaths
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def _ordered(self, array):
+        """Returns the valid part of a ring buffer array in chronological order (copy)"""
+        if self.count < self.capacity:
+            return array[:self.count].copy()
+        return np.concatenate((array[self.head:], array[:self.head]))
+
+    def get_series(self):
+        """
+        Getter for the stored time series in chronological order.
+
+        Returns:
+            tuple       (generations, population, births, deaths) numpy arrays of length len(self)
+        """
+        return (self._ordered(self.generations), self._ordered(self.population),
+                self._ordered(self.births), self._ordered(self.deaths))
+
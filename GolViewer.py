@@ -36,6 +36,8 @@ class GolViewer(QLabel):
     Attributes:
         gol         reference to an object of class GameOfLife (the model)
         drawing     bool value to keep track of mouse button long press and movement
+        lastCell    board cell (i, j) of the last mouse event of the current stroke (None if outside the board)
+        brush       side of the square brush used to draw and delete cells
         V_margin    dimension of right and left margin in window (widget) coordinates for the image
         H_margin    dimension of top and bottom margin in window (widget) coordinates for the image
         h           board (gol state) height
@@ -49,6 +51,8 @@ class GolViewer(QLabel):
         self.setAlignment(Qt.AlignCenter)
         self.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
         self.drawing = False
+        self.lastCell = None
+        self.brush = 1
         self.V_margin = 0
         self.H_margin = 0
         self.h = 0
@@ -105,66 +109,64 @@ class GolViewer(QLabel):
                 qim = QImage(im.data, im.shape[1], im.shape[0], im.strides[0], QImage.Format_ARGB32)
                 return qim
 
+    def cell_at(self, pos):
+        """
+        Converts a widget position to board cell indexes.
+
+        Args:
+            pos         position in widget coordinates (QPoint)
+
+        Returns:
+            tuple       (i, j) indexes of the cell, None if pos is outside the board
+        """
+        i = pos.y() - self.V_margin
+        j = pos.x() - self.H_margin
+        # check if mouse is inside the bounds of the board
+        if i > 0 and j > 0 and i < self.pixmap().height() and j < self.pixmap().width():
+            # convert widget coordinate to state indexes
+            return int(i * self.h / self.pixmap().height()), int(j * self.w / self.pixmap().width())
+        return None
+
+    def stroke_to(self, cell, alive):
+        """
+        Draws (or deletes) the segment from the last cell of the stroke to cell, so fast drags leave no gaps.
+
+        Args:
+            cell        (i, j) indexes of the cell or None if outside the board (the stroke restarts when back in)
+            alive       True to draw living cells, False to kill them
+
+        Returns:
+            bool        True if the board has been modified
+        """
+        if cell is None:
+            self.lastCell = None
+            return False
+        start = self.lastCell if self.lastCell is not None else cell
+        self.gol.draw_line(start[0], start[1], cell[0], cell[1], alive, self.brush)
+        self.lastCell = cell
+        return True
+
     def mousePressEvent(self, event):
         """Slot for mouse press event (Override)"""
-        if event.button() == Qt.LeftButton:  # if left click draw living cells
-            self.drawing = True
-            i = event.pos().y() - self.V_margin
-            j = event.pos().x() - self.H_margin
-            # check if mouse is inside the bounds of the board
-            if i > 0 and j > 0 and i < self.pixmap().height() and j < self.pixmap().width():
-                # convert widget coordinate to state indexes
-                i = int(i * self.h / self.pixmap().height())
-                j = int(j * self.w / self.pixmap().width())
-
-                self.gol.set_active_cell(i, j)
-                self.updateView()
-
-        if event.button() == Qt.RightButton:  # if right click kill cells
+        # left click draws living cells, right click kills cells
+        if event.button() == Qt.LeftButton or event.button() == Qt.RightButton:
             self.drawing = True
-            i = event.pos().y() - self.V_margin
-            j = event.pos().x() - self.H_margin
-            # check if mouse is inside the bounds of the board
-            if i > 0 and j > 0 and i < self.pixmap().height() and j < self.pixmap().width():
-                # convert widget coordinate to state indexes
-                i = int(i * self.h / self.pixmap().height())
-                j = int(j * self.w / self.pixmap().width())
-
-                self.gol.set_inactive_cell(i, j)
+            self.lastCell = None
+            if self.stroke_to(self.cell_at(event.pos()), event.button() == Qt.LeftButton):
                 self.updateView()
 
     def mouseMoveEvent(self, event):
         """Slot for mouse move event (Override)"""
-        if event.buttons() == Qt.LeftButton and self.drawing:  # if left click and self.drawing, draw living cells
-            i = event.pos().y() - self.V_margin
-            j = event.pos().x() - self.H_margin
-            # check if mouse is inside the bounds of the board
-            if i > 0 and j > 0 and i < self.pixmap().height() and j < self.pixmap().width():
-                # convert widget coordinate to state indexes
-                i = int(i * self.h / self.pixmap().height())
-                j = int(j * self.w / self.pixmap().width())
-
-                self.gol.set_active_cell(i, j)
-                if (timer() - self.lastUpdate) > 0.04:
-                    self.updateView()
-
-        if event.buttons() == Qt.RightButton and self.drawing:  # if right click and self.drawing, kill living cells
-            i = event.pos().y() - self.V_margin
-            j = event.pos().x() - self.H_margin
-            # check if mouse is inside the bounds of the board
-            if i > 0 and j > 0 and i < self.pixmap().height() and j < self.pixmap().width():
-                # convert widget coordinate to state indexes
-                i = int(i * self.h / self.pixmap().height())
-                j = int(j * self.w / self.pixmap().width())
-
-                self.gol.set_inactive_cell(i, j)
+        # if left (right) click and self.drawing, draw (kill) living cells
+        if (event.buttons() == Qt.LeftButton or event.buttons() == Qt.RightButton) and self.drawing:
+            if self.stroke_to(self.cell_at(event.pos()), event.buttons() == Qt.LeftButton):
                 if (timer() - self.lastUpdate) > 0.04:
                     self.updateView()
 
     def mouseReleaseEvent(self, event):
         """Slot for mouse release event (Override)"""
         # release the self.drawing mode
-        if event.button() == Qt.LeftButton and self.drawing:
-            self.drawing = False
-        if event.button() == Qt.RightButton and self.drawing:
+        if (event.button() == Qt.LeftButton or event.button() == Qt.RightButton) and self.drawing:
             self.drawing = False
+            self.lastCell = None
+            self.updateView()  # show the last segments skipped by the update rate limit
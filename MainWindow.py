@@ -27,7 +27,7 @@ from PyQt5.QtWidgets import (QSlider, QLabel, QPushButton, QVBoxLayout, QHBoxLay
                              QCheckBox)
 
 from GolViewer import GolViewer
-from MyWidgets import PatternMenu, PlayPauseButton
+from MyWidgets import PatternMenu, PlayPauseButton, PopulationPlot
 
 
 class MainWindow(QWidget):
@@ -58,6 +58,12 @@ class MainWindow(QWidget):
 
         self.loop.timeout.connect(self.viewer.updateView)
 
+        self.plot = PopulationPlot()
+        self.plot.hide()
+        self.plot.set_model(self.gol)
+
+        self.loop.timeout.connect(self.plot.updatePlot)
+
         self.play_pause = PlayPauseButton()
 
         self.reset = QPushButton()
@@ -79,6 +85,9 @@ class MainWindow(QWidget):
         self.check_box = QCheckBox("Heatmap (History)")
         self.check_box.stateChanged.connect(self.check_box_slot)
 
+        self.plot_check_box = QCheckBox("Population plot")
+        self.plot_check_box.stateChanged.connect(self.plot_check_box_slot)
+
         self.menu_label = QLabel("Known Patterns: ")
         self.menu = PatternMenu()
         self.menu.currentTextChanged.connect(self.change_pattern)
@@ -87,6 +96,7 @@ class MainWindow(QWidget):
         top_h_box.addWidget(self.menu_label)
         top_h_box.addWidget(self.menu)
         top_h_box.addStretch()
+        top_h_box.addWidget(self.plot_check_box)
         top_h_box.addWidget(self.check_box)
 
         bottom_h_box = QHBoxLayout()
@@ -102,6 +112,7 @@ class MainWindow(QWidget):
         v_box = QVBoxLayout()
         v_box.addLayout(top_h_box)
         v_box.addWidget(self.viewer)
+        v_box.addWidget(self.plot)
         v_box.addLayout(bottom_h_box)
 
         self.setLayout(v_box)
@@ -127,6 +138,7 @@ class MainWindow(QWidget):
             self.play_pause.changeText()
         self.gol.reset()
         self.viewer.updateView()
+        self.plot.updatePlot()
 
     def slider_changed(self):
         """Slot for the speed slider value changed signal. Changes the loop timeout time based on the speed"""
@@ -152,6 +164,7 @@ class MainWindow(QWidget):
         else:
             QMessageBox.about(self, "File Name Error", "No file name selected")
         self.viewer.updateView()
+        self.plot.updatePlot()
 
     def save_clicked(self):
         """Slot for the Save button click event. Opens a dialog to choose a file then signals the model to save to it"""
@@ -167,9 +180,15 @@ class MainWindow(QWidget):
         else:
             QMessageBox.about(self, "File Name Error", "No file name selected")
 
+    def closeEvent(self, ev):
+        """Slot for window close event (Override)"""
+        self.menu.stop_loader()
+        super().closeEvent(ev)
+
     def resizeEvent(self, ev):
         """Slot for window resize event (Override)"""
         self.viewer.updateView()
+        self.plot.updatePlot()
         super().resizeEvent(ev)
 
     def check_box_slot(self, code):
@@ -180,6 +199,11 @@ class MainWindow(QWidget):
             self.gol.set_do_heatmap(False)
         self.viewer.updateView()
 
+    def plot_check_box_slot(self, code):
+        """Slot for the Population plot checkbox changed state signal. Shows or hides the population plot"""
+        self.plot.setVisible(code == Qt.Checked)
+        self.plot.updatePlot()
+
     def change_pattern(self, text):
         """Slot for the ComboBox changed state signal. Loads the selected known pattern"""
         if self.loop.is_going():
@@ -193,6 +217,11 @@ class MainWindow(QWidget):
             last = self.menu.count() - 1
             if self.menu.itemText(last) == "- Custom pattern -":
                 self.menu.removeItem(last)
-            elif self.gol.load(self.menu.path_to_patterns + text) is False:
-                QMessageBox.about(self, "File Error", "File selected is not valid")
+            else:
+                board = self.menu.library.get_board(text)
+                if board is None:
+                    QMessageBox.about(self, "File Error", "File selected is not valid")
+                else:
+                    self.gol.set_board(board)
         self.viewer.updateView()
+        self.plot.updatePlot()
@@ -25,25 +25,81 @@
 import os
 import sys
 
-from PyQt5.QtWidgets import QComboBox, QPushButton
+import numpy as np
+from PyQt5.QtCore import Qt, QPointF, QSize, QThread, pyqtSignal
+from PyQt5.QtGui import QPixmap, QPainter, QPen, QPolygonF, QImage, QIcon
+from PyQt5.QtWidgets import QComboBox, QPushButton, QLabel, QSizePolicy
+
+from PatternLibrary import PatternLibrary
 
 class PatternMenu(QComboBox):
     """
     Custom combo box widget that auto populates its items with patterns found in the default directory
 
+    The items come from the cached index of the pattern library, the thumbnails are loaded in background.
+
     Attributes:
         path_to_patterns    default directory for patterns
+        library             PatternLibrary of path_to_patterns
         files               string list of the file names of the files in path_to_patterns
+        loader              background thread loading the thumbnails
     """
 
     def __init__(self):
         super().__init__()
         self.path_to_patterns = os.path.abspath(os.path.dirname(sys.argv[0])) + "/patterns/"
-        self.files = sorted([f for f in os.listdir(self.path_to_patterns) if not f.startswith('.')],
-                            key=lambda f: f.lower())
+        self.library = PatternLibrary(self.path_to_patterns)
+        self.files = self.library.names()
         self.addItem("Empty")
         self.addItem("Random")
         self.addItems(self.files)
+        self.setIconSize(QSize(32, 32))
+
+        self.loader = ThumbnailLoader(self.library, self.files)
+        self.loader.thumbnailReady.connect(self.set_thumbnail)
+        self.loader.start()
+
+    def set_thumbnail(self, name, thumbnail):
+        """Slot for the thumbnailReady signal of the loader. Sets the thumbnail as icon of the pattern item"""
+        i = self.findText(name)
+        if i >= 0:
+            qim = QImage(thumbnail.data, thumbnail.shape[1], thumbnail.shape[0], thumbnail.strides[0],
+                         QImage.Format_Grayscale8)
+            self.setItemIcon(i, QIcon(QPixmap.fromImage(qim)))
+
+    def stop_loader(self):
+        """Stops the thumbnail loader thread (to be called before quitting)"""
+        self.loader.requestInterruption()
+        self.loader.wait()
+
+
+class ThumbnailLoader(QThread):
+    """
+    Thread that parses the new patterns of a library and loads their thumbnails, emitting one signal per thumbnail
+
+    Attributes:
+        library     PatternLibrary of the patterns
+        names       names of the patterns to load
+    """
+    thumbnailReady = pyqtSignal(str, object)
+
+    def __init__(self, library, names):
+        super().__init__()
+
+        self.library = library
+        self.names = names
+
+    def run(self):
+        """Thread main method (Override)"""
+        parsed = bool(self.library.stale_names())
+        for name in self.names:
+            if self.isInterruptionRequested():
+                break
+            thumbnail = self.library.get_thumbnail(name)
+            if thumbnail is not None:
+                self.thumbnailReady.emit(name, thumbnail)
+        if parsed:
+            self.library.save_index()
 
 
 class PlayPauseButton(QPushButton):
@@ -67,4 +123,52 @@ class PlayPauseButton(QPushButton):
     def changeText(self):
         """Slot for the clicked event; automatically changes the button text"""
         self.i += 1
-        self.setText(self.btn_text[self.i % 2])
\ No newline at end of file
+        self.setText(self.btn_text[self.i % 2])
+
+
+class PopulationPlot(QLabel):
+    """
+    Custom widget that plots the population time series of the game (live cells per generation)
+
+    Attributes:
+        gol     reference to an object of class GameOfLife (the model)
+    """
+    def __init__(self):
+        super().__init__()
+
+        self.setFixedHeight(100)
+        self.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Fixed)
+        self.gol = None
+
+    def set_model(self, gol):
+        """
+        Set the reference to the gol model.
+
+        Args:
+            gol     object of class GameOfLife
+        """
+        self.gol = gol
+        self.updatePlot()
+
+    def updatePlot(self):
+        """Redraw the plot from the population history of the model (nothing is done while the widget is hidden)"""
+        if self.gol is None or not self.isVisible():
+            return
+        w = max(self.width(), 2)
+        h = max(self.height(), 2)
+        pix = QPixmap(w, h)
+        pix.fill(Qt.black)
+        _, population, _, _ = self.gol.get_population_history()
+        painter = QPainter(pix)
+        if len(population) > 1:
+            if len(population) > w:  # no more points than pixels
+                population = population[np.linspace(0, len(population) - 1, w).astype(np.int64)]
+            xs = np.linspace(0, w - 1, len(population))
+            ys = (h - 1) - population * (h - 1) / max(int(population.max()), 1)
+            painter.setPen(QPen(Qt.green))
+            painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs, ys)]))
+        painter.setPen(QPen(Qt.white))
+        painter.drawText(5, 15, "Generation: {}  Population: {}".format(self.gol.get_generation(),
+                                                                        self.gol.get_population()))
+        painter.end()
+        self.setPixmap(pix)
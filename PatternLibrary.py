@@ -0,0 +1,258 @@
+##
+## MIT License
+## 
+## Copyright (c) 2017 Luca Angioloni
+## 
+## Permission is hereby granted, free of charge, to any person obtaining a copy
+## of this software and associated documentation files (the "Software"), to deal
+## in the Software without restriction, including without limitation the rights
+## to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+## copies of the Software, and to permit persons to whom the Software is
+## furnished to do so, subject to the following conditions:
+## 
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+## 
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+##
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from GameOfLife import PIXEL_MAX, read_pattern
+
+LIBRARY_VERSION = 1  # Version of the cache format (bump to invalidate the caches)
+LRU_SIZE = 32  # Number of boards kept in memory
+THUMBNAIL_SIZE = 48  # Maximum width and height of the thumbnails
+
+
+class PatternLibrary:
+    """
+    Indexed library of the pattern files of a directory.
+
+    The index (name, size, population, format and mtime of each pattern) is persisted in a cache directory and
+    revalidated at startup only comparing mtime and size of the files. The patterns are parsed once and stored packed
+    (1 bit per cell) in the cache directory, together with their thumbnails. The most recently used boards are kept in
+    memory (LRU).
+
+    All the methods are thread safe, so the thumbnails can be generated in a background thread.
+
+    Attributes:
+        path_to_patterns    directory of the pattern files
+        cache_dir           directory of the cached index, packed boards and thumbnails
+        index               dictionary from pattern name (file name) to its index entry
+        boards              LRU cache (OrderedDict) of the most recently used boards
+    """
+
+    def __init__(self, path_to_patterns, cache_dir=None):
+        """
+        Init method.
+
+        Args:
+            path_to_patterns    directory of the pattern files
+            cache_dir           cache directory (default: .cache in path_to_patterns)
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(path_to_patterns, ".cache")
+        self.path_to_patterns = path_to_patterns
+        self.cache_dir = cache_dir
+        self.boards = OrderedDict()
+        self.lock = threading.RLock()
+        self.index = self.load_index()
+        self.scan()
+
+    def index_file(self):
+        """Returns the path of the cached index"""
+        return os.path.join(self.cache_dir, "index.json")
+
+    def cache_file(self, name, suffix):
+        """Returns the path of a cached file of a pattern (file names are hashed, pattern names can be anything)"""
+        return os.path.join(self.cache_dir, hashlib.md5(name.encode()).hexdigest() + suffix)
+
+    def load_index(self):
+        """Loads the cached index, returns an empty index if it is missing or outdated"""
+        try:
+            with open(self.index_file()) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cache.get("version") != LIBRARY_VERSION:
+            return {}
+        return cache.get("patterns", {})
+
+    def save_index(self):
+        """Writes the index to the cache directory (a read only directory just disables the cache)"""
+        with self.lock:
+            cache = {"version": LIBRARY_VERSION, "patterns": self.index}
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(self.index_file(), "w") as f:
+                    json.dump(cache, f)
+            except OSError:
+                pass
+
+    def scan(self):
+        """
+        Revalidates the index against the pattern files: entries of removed files are dropped and entries of new or
+        modified files are marked as stale (they are parsed lazily by update).
+        """
+        files = {}
+        if os.path.isdir(self.path_to_patterns):
+            for entry in os.scandir(self.path_to_patterns):
+                if not entry.name.startswith('.') and entry.is_file():
+                    st = entry.stat()
+                    files[entry.name] = (st.st_mtime, st.st_size)
+        with self.lock:
+            for name in list(self.index):
+                if name not in files:
+                    del self.index[name]
+            for name, (mtime, size) in files.items():
+                entry = self.index.get(name)
+                if entry is None or entry["mtime"] != mtime or entry["size"] != size:
+                    self.index[name] = {"mtime": mtime, "size": size, "format": os.path.splitext(name)[1][1:],
+                                        "stale": True}
+                    self.boards.pop(name, None)
+
+    def signature(self):
+        """Returns the modification time and size of each pattern file, to revalidate caches derived from the library"""
+        with self.lock:
+            return {name: [entry["mtime"], entry["size"]] for name, entry in self.index.items()}
+
+    def names(self):
+        """Returns the pattern names sorted case insensitively"""
+        with self.lock:
+            return sorted(self.index, key=lambda n: n.lower())
+
+    def stale_names(self):
+        """Returns the names of the patterns not parsed yet (or modified since they were parsed)"""
+        with self.lock:
+            return [n for n in self.names() if self.index[n].get("stale")]
+
+    def get_entry(self, name):
+        """
+        Getter for the index entry of a pattern (parsing the pattern if needed).
+
+        Returns:
+            dict        rows, cols, population, format, mtime and size of the pattern, None if not valid
+        """
+        if not self.update(name):
+            return None
+        with self.lock:
+            return dict(self.index[name])
+
+    def update(self, name):
+        """
+        Parses a stale pattern storing the packed board, the thumbnail and the index entry.
+
+        Returns:
+            bool        True if the pattern is valid (already up to date or parsed now), False otherwise
+        """
+        with self.lock:
+            entry = self.index.get(name)
+            if entry is None or entry.get("invalid"):
+                return False
+            if not entry.get("stale"):
+                return True
+        try:
+            mat = read_pattern(os.path.join(self.path_to_patterns, name))
+        except (OSError, ValueError):  # unreadable or malformed file (bad encoding, not an image...)
+            mat = None
+        with self.lock:
+            if self.index.get(name) is not entry:  # rescanned meanwhile
+                return self.update(name)
+            if entry.pop("stale", None) is None:  # parsed meanwhile by another thread
+                return not entry.get("invalid")
+            if mat is None:
+                entry["invalid"] = True
+                return False
+            alive = mat > 128
+            entry["rows"], entry["cols"] = mat.shape
+            entry["population"] = int(np.count_nonzero(alive))
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                np.save(self.cache_file(name, ".npy"), np.packbits(alive))
+                np.save(self.cache_file(name, ".thumb.npy"), make_thumbnail(alive))
+            except OSError:
+                pass
+            self.remember(name, mat)
+            return True
+
+    def get_board(self, name):
+        """
+        Getter for the board of a pattern: from memory, from the packed cache or parsing the file.
+
+        Returns:
+            np.ndarray  the state matrix (read only: GameOfLife.set_board copies it), None if not valid
+        """
+        with self.lock:
+            if name in self.boards:
+                self.boards.move_to_end(name)
+                return self.boards[name]
+        if not self.update(name):
+            return None
+        with self.lock:
+            if name in self.boards:
+                return self.boards[name]
+            entry = self.index[name]
+            try:
+                packed = np.load(self.cache_file(name, ".npy"))
+            except (OSError, ValueError):
+                entry["stale"] = True  # cache deleted: parse again
+                return self.get_board(name)
+            count = entry["rows"] * entry["cols"]
+            mat = np.unpackbits(packed, count=count).reshape(entry["rows"], entry["cols"]) * np.uint8(PIXEL_MAX)
+            self.remember(name, mat)
+            return mat
+
+    def get_thumbnail(self, name):
+        """
+        Getter for the thumbnail of a pattern.
+
+        Returns:
+            np.ndarray  uint8 image at most THUMBNAIL_SIZE x THUMBNAIL_SIZE, None if the pattern is not valid
+        """
+        if not self.update(name):
+            return None
+        try:
+            return np.load(self.cache_file(name, ".thumb.npy"))
+        except (OSError, ValueError):
+            board = self.get_board(name)
+            return None if board is None else make_thumbnail(board > 128)
+
+    def remember(self, name, mat):
+        """Stores a board in the LRU cache (made read only), evicting the least recently used one if full"""
+        mat.flags.writeable = False
+        with self.lock:
+            self.boards[name] = mat
+            self.boards.move_to_end(name)
+            while len(self.boards) > LRU_SIZE:
+                self.boards.popitem(last=False)
+
+
+def make_thumbnail(alive):
+    """
+    Makes the thumbnail of a board: each thumbnail pixel is alive if any cell of the block it covers is alive.
+
+    Args:
+        alive       boolean numpy array (True for living cells)
+
+    Returns:
+        np.ndarray  uint8 image at most THUMBNAIL_SIZE x THUMBNAIL_SIZE (0 dead, PIXEL_MAX alive)
+    """
+    rows, cols = alive.shape
+    f = max(-(-max(rows, cols, 1) // THUMBNAIL_SIZE), 1)  # block size (ceil division)
+    padded = np.zeros((-(-rows // f) * f, -(-cols // f) * f), dtype=bool)
+    padded[:rows, :cols] = alive
+    blocks = padded.reshape(padded.shape[0] // f, f, padded.shape[1] // f, f).any(axis=(1, 3))
+    return blocks.astype(np.uint8) * np.uint8(PIXEL_MAX)
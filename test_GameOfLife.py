@@ -0,0 +1,176 @@
+##
+## MIT License
+## 
+## Copyright (c) 2017 Luca Angioloni
+## 
+## Permission is hereby granted, free of charge, to any person obtaining a copy
+## of this software and associated documentation files (the "Software"), to deal
+## in the Software without restriction, including without limitation the rights
+## to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+## copies of the Software, and to permit persons to whom the Software is
+## furnished to do so, subject to the following conditions:
+## 
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+## 
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+##
+
+import os
+import unittest
+
+import numpy as np
+
+from GameOfLife import GameOfLife, PIXEL_MAX, find_bounding_box
+
+PATTERNS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "patterns")
+
+
+class GolTestCase(unittest.TestCase):
+    """Base class of the GameOfLife tests"""
+
+    def assertStats(self, gol):
+        """Checks population, bounding box and heatmap against a full board recomputation"""
+        alive = gol.mat > 128
+        self.assertTrue((gol.heatmap[alive] == PIXEL_MAX).all())
+        self.assertEqual(gol.get_population(), int(np.count_nonzero(alive)))
+        box = find_bounding_box(alive)
+        if box is not None:  # the attribute can be larger than the exact box, never smaller
+            top, left, bottom, right = gol.bounding_box
+            self.assertTrue(top <= box[0] and left <= box[1] and bottom >= box[2] and right >= box[3])
+        self.assertEqual(gol.get_bounding_box(), box)
+
+
+class GameOfLifeStatsTest(GolTestCase):
+    """Tests of the statistics maintained incrementally by GameOfLife"""
+
+    def test_fuzz(self):
+        """Random steps and edits keep the statistics equal to a full board recomputation"""
+        rng = np.random.RandomState(0)
+        gol = GameOfLife(40, 50, 'random', history_size=16)
+        populations = [gol.get_population()]
+        for _ in range(500):
+            op = rng.randint(3)
+            if op == 0:
+                old = gol.mat > 128
+                gol.next()
+                new = gol.mat > 128
+                self.assertEqual(gol.get_births(), int(np.count_nonzero(new & ~old)))
+                self.assertEqual(gol.get_deaths(), int(np.count_nonzero(old & ~new)))
+                populations.append(gol.get_population())
+            else:
+                i, j = rng.randint(40), rng.randint(50)
+                if op == 1:
+                    gol.set_active_cell(i, j)
+                else:
+                    gol.set_inactive_cell(i, j)
+            self.assertStats(gol)
+
+        generations, population, births, deaths = gol.get_population_history()
+        self.assertEqual(len(generations), 16)
+        self.assertEqual(list(generations), list(range(len(populations) - 16, len(populations))))
+        self.assertEqual(list(population), populations[-16:])
+
+    def test_reset_and_load(self):
+        """Reset and load restart the statistics and the history"""
+        gol = GameOfLife()
+        gol.load(os.path.join(PATTERNS, "glider.txt"))
+        self.assertStats(gol)
+        for _ in range(10):
+            gol.next()
+        gol.reset()
+        self.assertEqual(gol.get_generation(), 0)
+        self.assertEqual(len(gol.get_population_history()[0]), 1)
+        self.assertStats(gol)
+        gol.reinitialize('empty')
+        self.assertEqual(gol.get_population(), 0)
+        self.assertIsNone(gol.get_bounding_box())
+        gol.next()
+        self.assertIsNone(gol.get_bounding_box())
+
+
+class GameOfLifeEditTest(GolTestCase):
+    """Tests of the batched editing methods of GameOfLife"""
+
+    def setUp(self):
+        self.gol = GameOfLife(20, 30)
+
+    def test_set_cells(self):
+        """Duplicated and out of board indexes are handled"""
+        self.gol.set_cells([1, 1, 1, -1, 20, 5], [2, 2, 3, 0, 0, 30])
+        self.assertEqual(self.gol.get_population(), 2)
+        self.assertEqual(self.gol.get_bounding_box(), (1, 2, 1, 3))
+        self.assertStats(self.gol)
+        self.gol.set_cells([1, 1, 7], [2, 2, 7], alive=False)
+        self.assertEqual(self.gol.get_population(), 1)
+        self.assertEqual(self.gol.get_bounding_box(), (1, 3, 1, 3))
+        self.assertStats(self.gol)
+        self.gol.set_cells([], [])
+        self.assertStats(self.gol)
+
+    def test_draw_line(self):
+        """Segments have no gaps, brushes are centered on the segment and clipped to the board"""
+        self.gol.draw_line(2, 3, 5, 15)
+        alive = self.gol.mat > 128
+        self.assertEqual(self.gol.get_population(), 13)  # one cell per column
+        self.assertTrue(alive[:, 3:16].any(axis=0).all())
+        self.assertEqual(self.gol.get_bounding_box(), (2, 3, 5, 15))
+        self.assertStats(self.gol)
+
+        self.gol.draw_line(10, 10, 10, 10, brush=3)
+        self.assertTrue((self.gol.mat[9:12, 9:12] > 128).all())
+        self.assertStats(self.gol)
+
+        self.gol.draw_line(-5, -5, 25, 35, brush=4)  # diagonal across the whole board
+        self.assertStats(self.gol)
+        self.gol.draw_line(-5, -5, 25, 35, alive=False, brush=4)
+        self.assertStats(self.gol)
+        self.gol.draw_line(19, 0, 0, 29, alive=False, brush=40)
+        self.assertEqual(self.gol.get_population(), 0)
+        self.assertIsNone(self.gol.get_bounding_box())
+
+    def test_set_rect(self):
+        """Rectangles are clipped to the board and update the statistics"""
+        self.gol.set_rect(-3, -3, 4, 5)
+        self.assertEqual(self.gol.get_population(), 5 * 6)
+        self.assertEqual(self.gol.get_bounding_box(), (0, 0, 4, 5))
+        self.gol.set_rect(2, 2, 100, 100, alive=False)
+        self.assertEqual(self.gol.get_population(), 5 * 6 - 3 * 4)
+        self.assertEqual(self.gol.get_bounding_box(), (0, 0, 4, 5))
+        self.assertStats(self.gol)
+        self.gol.set_rect(5, 5, 4, 4)  # empty rectangle
+        self.gol.set_rect(30, 40, 50, 60)  # out of the board
+        self.assertStats(self.gol)
+
+    def test_paste(self):
+        """Patterns of any type are pasted, clipped to the board, in every mode"""
+        glider = [[0, 1, 0], [0, 0, 1], [1, 1, 1]]
+        for pattern in (glider, np.array(glider, dtype=bool), np.array(glider) * PIXEL_MAX,
+                        np.array(glider, dtype=np.uint8) * PIXEL_MAX):
+            gol = GameOfLife(20, 30)
+            self.assertTrue(gol.paste(pattern, 5, 5))
+            self.assertEqual(gol.get_population(), 5)
+            self.assertEqual(gol.get_bounding_box(), (5, 5, 7, 7))
+            self.assertStats(gol)
+
+        self.gol.paste(glider, -1, 28)  # only the cells inside the board
+        self.assertEqual(self.gol.get_population(), 2)
+        self.assertEqual(self.gol.get_bounding_box(), (1, 28, 1, 29))
+        self.gol.set_rect(0, 0, 19, 29)
+        self.gol.paste(glider, 18, 27, mode='replace')
+        self.assertEqual(self.gol.get_population(), 20 * 30 - 4)
+        self.assertStats(self.gol)
+        self.gol.paste(np.ones((20, 30), dtype=np.int64), 0, 0, mode='clear')
+        self.assertEqual(self.gol.get_population(), 0)
+        self.assertStats(self.gol)
+        self.assertFalse(self.gol.paste(glider, 0, 0, mode='xor'))
+
+
+if __name__ == '__main__':
+    unittest.main()
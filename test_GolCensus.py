@@ -0,0 +1,120 @@
+##
+## MIT License
+## 
+## Copyright (c) 2017 Luca Angioloni
+## 
+## Permission is hereby granted, free of charge, to any person obtaining a copy
+## of this software and associated documentation files (the "Software"), to deal
+## in the Software without restriction, including without limitation the rights
+## to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+## copies of the Software, and to permit persons to whom the Software is
+## furnished to do so, subject to the following conditions:
+## 
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+## 
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+##
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from GameOfLife import GameOfLife, PIXEL_MAX
+from GolCensus import GolCensus, COMMON_OBJECTS, orientations
+from PatternLibrary import PatternLibrary
+
+PATTERNS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "patterns")
+
+
+def parse(rows):
+    """Converts a pattern in the TXT format (list of strings) to a boolean matrix"""
+    return np.array([[c != "." for c in row] for row in rows], dtype=bool)
+
+
+def board_with(*objects):
+    """Returns a 60 x 60 state matrix with the (cluster, i, j) objects placed at (i, j)"""
+    mat = np.zeros((60, 60), dtype=np.uint8)
+    for cluster, i, j in objects:
+        mat[i:i + cluster.shape[0], j:j + cluster.shape[1]][cluster] = PIXEL_MAX
+    return mat
+
+
+def phases(cluster, generations=40):
+    """Returns the phases (cropped boolean matrices) of an object evolving it for some generations"""
+    gol = GameOfLife()
+    gol.set_board(board_with((cluster, 20, 20)))
+    result = []
+    for _ in range(generations):
+        top, left, bottom, right = gol.get_bounding_box()
+        result.append(gol.mat[top:bottom + 1, left:right + 1] > 128)
+        gol.next()
+    return result
+
+
+class GolCensusTest(unittest.TestCase):
+    """Tests of the GolCensus class"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        path_to_patterns = os.path.join(cls.tmp, "patterns")
+        os.mkdir(path_to_patterns)
+        shutil.copy(os.path.join(PATTERNS, "pulsar.txt"), path_to_patterns)
+        with open(os.path.join(path_to_patterns, "garbage.png"), "wb") as f:  # unreadable files are skipped
+            f.write(b"not a png")
+        cls.census = GolCensus(PatternLibrary(path_to_patterns))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp)
+
+    def test_common_objects(self):
+        """Every built-in object is identified once in every phase and orientation"""
+        for name, rows in COMMON_OBJECTS.items():
+            for phase in phases(parse(rows), 8):
+                for cluster in orientations(phase):
+                    self.assertEqual(self.census.census(board_with((cluster, 20, 20))), {name: 1}, name)
+
+    def test_split_phases(self):
+        """Objects split in separate clusters in some phases are counted once"""
+        gol = GameOfLife()
+        gol.load(os.path.join(PATTERNS, "pulsar.txt"))
+        top, left, bottom, right = gol.get_bounding_box()
+        pulsar = phases(gol.mat[top:bottom + 1, left:right + 1] > 128, 5)[2:]  # it becomes a pulsar at generation 2
+        toad = phases(parse(COMMON_OBJECTS["toad"]), 2)
+        beacon = phases(parse(COMMON_OBJECTS["beacon"]), 2)
+        for name, cycle in (("pulsar", pulsar), ("toad", toad), ("beacon", beacon)):
+            split = [p for p in cycle if len(self.census.clusters(board_with((p, 20, 20)))) > 1]
+            self.assertTrue(split, name)
+            for phase in split:
+                self.assertEqual(self.census.census(board_with((phase, 10, 10))), {name: 1}, name)
+
+    def test_close_objects(self):
+        """Close objects not forming a known object are counted separately"""
+        traffic_light = parse(["..XXX..",
+                               ".......",
+                               "X.....X",
+                               "X.....X",
+                               "X.....X",
+                               ".......",
+                               "..XXX.."])
+        bi_block = parse(["XX.XX",
+                          "XX.XX"])
+        self.assertEqual(self.census.census(board_with((traffic_light, 10, 10))), {"blinker": 4})
+        self.assertEqual(self.census.census(board_with((bi_block, 10, 10))), {"block": 2})
+        self.assertEqual(self.census.census(board_with((traffic_light, 10, 10), (bi_block, 40, 40))),
+                         {"blinker": 4, "block": 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
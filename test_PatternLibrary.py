@@ -0,0 +1,108 @@
+##
+## MIT License
+## 
+## Copyright (c) 2017 Luca Angioloni
+## 
+## Permission is hereby granted, free of charge, to any person obtaining a copy
+## of this software and associated documentation files (the "Software"), to deal
+## in the Software without restriction, including without limitation the rights
+## to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+## copies of the Software, and to permit persons to whom the Software is
+## furnished to do so, subject to the following conditions:
+## 
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+## 
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+##
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from PatternLibrary import PatternLibrary
+
+PATTERNS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "patterns")
+
+
+class PatternLibraryTest(unittest.TestCase):
+    """Tests of the PatternLibrary class"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path_to_patterns = os.path.join(self.tmp, "patterns")
+        os.mkdir(self.path_to_patterns)
+        shutil.copy(os.path.join(PATTERNS, "glider.txt"), self.path_to_patterns)
+        shutil.copy(os.path.join(PATTERNS, "pulsar.txt"), self.path_to_patterns)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_concurrent_get_board(self):
+        """Two threads parsing the same stale pattern must both get the board"""
+        for _ in range(30):
+            shutil.rmtree(os.path.join(self.path_to_patterns, ".cache"), ignore_errors=True)
+            library = PatternLibrary(self.path_to_patterns)
+            barrier = threading.Barrier(2)
+            results = []
+            errors = []
+
+            def get():
+                barrier.wait()
+                try:
+                    results.append(library.get_board("glider.txt"))
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=get) for _ in range(2)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(errors, [])
+            self.assertEqual(len(results), 2)
+            for board in results:
+                self.assertIsNotNone(board)
+                self.assertEqual(int((board > 128).sum()), 5)
+
+    def test_board_read_only(self):
+        """Boards returned from the LRU cache cannot be modified"""
+        library = PatternLibrary(self.path_to_patterns)
+        board = library.get_board("pulsar.txt")
+        with self.assertRaises(ValueError):
+            board[0, 0] = 255
+        self.assertIs(library.get_board("pulsar.txt"), board)
+
+    def test_invalid_files(self):
+        """Files that cannot be parsed are marked invalid once and do not raise"""
+        with open(os.path.join(self.path_to_patterns, "latin1.txt"), "wb") as f:
+            f.write(b"..X\xe9\xff..\n")
+        with open(os.path.join(self.path_to_patterns, "garbage.png"), "wb") as f:
+            f.write(b"not a png")
+        library = PatternLibrary(self.path_to_patterns)
+        for name in ("latin1.txt", "garbage.png"):
+            self.assertIsNone(library.get_board(name))
+            self.assertIsNone(library.get_thumbnail(name))
+            self.assertTrue(library.index[name]["invalid"])
+            self.assertNotIn(name, library.stale_names())
+
+    def test_cached_index(self):
+        """A new library reads the index and the packed boards from the cache without parsing again"""
+        library = PatternLibrary(self.path_to_patterns)
+        board = library.get_board("glider.txt")
+        library.save_index()
+        library = PatternLibrary(self.path_to_patterns)
+        self.assertNotIn("glider.txt", library.stale_names())
+        self.assertTrue((library.get_board("glider.txt") == board).all())
+
+
+if __name__ == '__main__':
+    unittest.main()